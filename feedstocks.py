@@ -1,38 +1,83 @@
 #!/usr/bin/env python3
 
+from __future__ import annotations
+
 import argparse
 import bz2
+import concurrent.futures
+import contextlib
 import dataclasses
 import enum
+import errno
+import functools
+import hashlib
 import io
 import json
 import os
-import posixpath
 import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import time
 import typing as t
 from pathlib import Path
 
-import databind.json
-import github
-import jinja2
-import networkx
-import nr.utils.git
 import requests
-import termcolor
 import yaml
-from grayskull import __version__ as grayskull_version
-from grayskull.base.base_recipe import AbstractRecipeModel
-from grayskull.cli import CLIConfig
-from grayskull.base.factory import GrayskullFactory
-from nr.stream import Stream
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from termcolor import cprint
 
+# Grayskull, PyGithub, networkx and friends are slow to import and not needed by every action (e.g. --list),
+# so they are imported where they are used.
+if t.TYPE_CHECKING:
+  import github
+  import jinja2
+  import nr.utils.git
+  from grayskull.base.base_recipe import AbstractRecipeModel
+
 RECIPE_RAW_URL_TEMPLATE = 'https://raw.githubusercontent.com/conda-forge/{package}-feedstock/master/recipe/meta.yaml'
 STAGED_RECIPES_CLONE_URL_TEMPLATE = 'https://github.com/{user}/staged-recipes.git'
+MAX_WORKERS = 16
+UPLOAD_WORKERS = 8
+GENERATE_WORKERS = 8
+GIT_WORKERS = 8
+META_YAML_HEAD_BYTES = 2048
+LIST_STATE_FILE = '.feedstocks.state.json'
+LIST_STATE_MAX_AGE = 3600
+HTTP_RETRIES = 3
+HTTP_RETRY_STATUSES = (502, 503, 504)
+CACHE_DIR = Path(os.getenv('XDG_CACHE_HOME', '~/.cache')).expanduser() / 'conda-feedstocks'
+
+_VERSION_RE = re.compile(r'{%\s*set\s+version\s*=\s*"(.*?)"\s*%}')
+_DEP_SPLIT_RE = re.compile(r'[\s<>=!]')
+_CACHE_VALIDATORS = {'ETag': 'If-None-Match', 'Last-Modified': 'If-Modified-Since'}
+_REQUIREMENTS_RE = re.compile(r'^requirements:[ \t]*(?:#.*)?$', re.M)
+_TOP_LEVEL_KEY_RE = re.compile(r'[A-Za-z_][\w.-]*:(?:\s|$)')
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)  # Prefer the libyaml parser where available.
+
+# Precomputed escape sequences for the hot print loops; empty when stdout is not a terminal.
+_ANSI = dict.fromkeys(('green', 'yellow', 'red', 'reset'), '')
+if sys.stdout.isatty():
+  _ANSI.update(green='\033[32m', yellow='\033[33m', red='\033[31m', reset='\033[0m')
+
+# A shared session so that consecutive requests to the same host reuse pooled keep-alive connections.
+# Only idempotent reads are retried by the adapter; upload_file() retries uploads itself, as a streamed body
+# cannot be replayed.
+_RETRY = Retry(
+  total=HTTP_RETRIES,
+  backoff_factor=0.5,
+  status_forcelist=HTTP_RETRY_STATUSES,
+  allowed_methods=frozenset(['GET', 'HEAD']),
+  raise_on_status=False)
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=_RETRY))
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=20, max_retries=_RETRY))
+
+
+T = t.TypeVar('T')
+R = t.TypeVar('R')
 
 
 @dataclasses.dataclass
@@ -43,48 +88,439 @@ class Config:
   conda_bin: t.Optional[str] = None
   after_clone: t.Optional[str] = None
 
+  @classmethod
+  def from_dict(cls, data: t.Dict[str, t.Any]) -> 'Config':
+    unknown_keys = data.keys() - {field.name for field in dataclasses.fields(cls)}
+    if unknown_keys:
+      raise ValueError(f'unknown keys in config: {", ".join(sorted(unknown_keys))}')
+    return cls(**data)
+
   def get_conda_bin(self) -> str:
     return os.path.expanduser(self.conda_bin) if self.conda_bin else 'conda'
 
 
+def map_concurrently(func: t.Callable[[T], R], items: t.Iterable[T], max_workers: int = MAX_WORKERS) -> t.List[R]:
+  """
+  Calls *func* for every item in a thread pool and returns the results in the order of *items*. Meant for
+  I/O bound work such as HTTP requests, where the waits can overlap.
+  """
+
+  with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+    return list(executor.map(func, items))
+
+
 def get_latest_conda_smithy_version() -> str:
-  request = requests.get('https://api.anaconda.org/package/conda-forge/conda-smithy')
+  request = _SESSION.get('https://api.anaconda.org/package/conda-forge/conda-smithy', timeout=(5, 30))
   request.raise_for_status()
   return request.json()['latest_version']
 
 
 def get_latest_pypi_version(package: str) -> t.Optional[str]:
-  response = requests.get(f'https://pypi.org/pypi/{package}/json')
+  response = _SESSION.get(f'https://pypi.org/pypi/{package}/json', timeout=(5, 30))
   response.raise_for_status()
   data = response.json()
   return data['info']['version']
 
 
+def _load_json(data: bytes) -> t.Any:
+  try:
+    import orjson
+  except ImportError:
+    return json.loads(data)
+  return orjson.loads(data)
+
+
 def get_conda_forge_repodata(channel: str) -> t.Dict[str, t.Any]:
-  response = requests.get(f'https://conda.anaconda.org/conda-forge/{channel}/repodata.json.bz2', stream=True)
-  response.raise_for_status()
-  return json.loads(bz2.decompress(response.content).decode())
+  """
+  Downloads the conda-forge repodata for *channel*.
+  """
 
+  with _stream_conda_forge_repodata(channel) as fp:
+    return _load_json(fp.read())
 
-def get_feedstock_meta_yaml(package_name: str) -> t.Optional[str]:
-  url = RECIPE_RAW_URL_TEMPLATE.format(package=package_name)
-  response = requests.get(url)
+
+class _ResponseReader:
+  """
+  A file-like object that reads from the decompressing *reader* and closes the streamed *response* with it.
+  """
+
+  def __init__(self, reader: t.BinaryIO, response: requests.Response) -> None:
+    self._reader = reader
+    self._response = response
+
+  def read(self, size: int = -1) -> bytes:
+    return self._reader.read(size)
+
+  def close(self) -> None:
+    try:
+      self._reader.close()
+    finally:
+      self._response.close()
+
+  def __enter__(self) -> '_ResponseReader':
+    return self
+
+  def __exit__(self, *args: t.Any) -> None:
+    self.close()
+
+
+def _stream_conda_forge_repodata(channel: str) -> _ResponseReader:
+  """
+  Returns a file-like object that decompresses the repodata of the conda-forge *channel* while it is being
+  downloaded. The zstd compressed variant is preferred because it decompresses much faster than bz2, but
+  that requires the optional `zstandard` package.
+  """
+
+  url = f'https://conda.anaconda.org/conda-forge/{channel}/repodata.json'
+  try:
+    import zstandard
+  except ImportError:
+    pass
+  else:
+    response = _SESSION.get(url + '.zst', stream=True, timeout=(5, 60))
+    if response.status_code != 404:
+      response.raise_for_status()
+      response.raw.decode_content = True
+      return _ResponseReader(zstandard.ZstdDecompressor().stream_reader(response.raw), response)
+    response.close()
+
+  response = _SESSION.get(url + '.bz2', stream=True, timeout=(5, 60))
+  response.raise_for_status()
+  response.raw.decode_content = True
+  return _ResponseReader(bz2.BZ2File(response.raw), response)
+
+
+def get_conda_forge_package_index(channel: str) -> t.Dict[str, t.Set[str]]:
+  """
+  Returns a mapping of lower-cased package names in the conda-forge *channel* to the versions that have
+  been built. With the optional `ijson` package, the repodata is parsed incrementally while it is downloaded,
+  which avoids holding the whole decoded document in memory.
+  """
+
+  try:
+    import ijson
+  except ImportError:
+    ijson = None
+
+  index: t.Dict[str, t.Set[str]] = {}
+  with contextlib.ExitStack() as stack:
+    if ijson is not None:
+      fp = stack.enter_context(_stream_conda_forge_repodata(channel))
+      packages: t.Iterable[t.Tuple[str, t.Dict[str, t.Any]]] = ijson.kvitems(fp, 'packages')
+    else:
+      packages = get_conda_forge_repodata(channel)['packages'].items()
+    for _, info in packages:
+      index.setdefault(info['name'].lower(), set()).add(info['version'])
+  return index
+
+
+def get_anaconda_package_versions(package_name: str, channel: str = 'conda-forge') -> t.List[str]:
+  """
+  Returns the versions of a package published to the *channel* on anaconda.org. Unlike the repodata, this
+  is not subject to CDN delays.
+  """
+
+  response = _SESSION.get(f'https://api.anaconda.org/package/{channel}/{package_name}', timeout=(5, 30))
   if response.status_code == 404:
+    return []
+  response.raise_for_status()
+  return response.json()['versions']
+
+
+def get_with_http_cache(
+  url: str,
+  cache_key: str,
+  headers: t.Optional[t.Dict[str, str]] = None,
+) -> t.Optional[str]:
+  """
+  Fetches the text at *url*, caching the response body and its `ETag`/`Last-Modified` validators under
+  *cache_key* in the #CACHE_DIR. When a cached copy exists, the request is made conditional so the server
+  can answer with an empty `304 Not Modified`. Returns #None if the server responds with 404.
+  """
+
+  body_file = CACHE_DIR / f'{cache_key}.yaml'
+  validator_files = {header: CACHE_DIR / f'{cache_key}.{header.lower()}' for header in _CACHE_VALIDATORS}
+  headers = dict(headers or {})
+  if body_file.is_file():
+    for header, request_header in _CACHE_VALIDATORS.items():
+      if validator_files[header].is_file():
+        headers[request_header] = validator_files[header].read_text(encoding='utf-8')
+
+  response = _SESSION.get(url, headers=headers, timeout=(5, 30))
+  if response.status_code == 304:
+    return body_file.read_text(encoding='utf-8')
+  for validator_file in validator_files.values():
+    validator_file.unlink(missing_ok=True)
+  if response.status_code == 404:
+    body_file.unlink(missing_ok=True)
     return None
   response.raise_for_status()
+
+  # The old validators are gone before the body is replaced, so they can never be paired with a new body.
+  validators = {header: response.headers[header] for header in _CACHE_VALIDATORS if header in response.headers}
+  if validators:
+    body_file.parent.mkdir(parents=True, exist_ok=True)
+    body_file.write_text(response.text, encoding='utf-8')
+    for header, value in validators.items():
+      validator_files[header].write_text(value, encoding='utf-8')
   return response.text
 
 
-def get_version_from_meta_yaml(meta_yaml: str) -> str:
-  return re.search(r'{%\s*set\s+version\s*=\s*"(.*?)"\s*%}', meta_yaml).group(1)
+@functools.lru_cache(maxsize=None)
+def get_feedstock_meta_yaml(package_name: str, max_bytes: t.Optional[int] = None) -> t.Optional[str]:
+  """
+  Returns the `recipe/meta.yaml` of the feedstock for *package_name*, or #None if there is no such feedstock.
+  With *max_bytes*, only the start of the file is requested with a `Range` header; that is enough to read the
+  variables defined at the top of the recipe.
+  """
+
+  url = RECIPE_RAW_URL_TEMPLATE.format(package=package_name)
+  if max_bytes is None:
+    return get_with_http_cache(url, f'meta-yaml/{package_name}')
+  headers = {'Range': f'bytes=0-{max_bytes - 1}'}
+  return get_with_http_cache(url, f'meta-yaml-{max_bytes}/{package_name}', headers)
+
+
+@functools.lru_cache(maxsize=None)
+def feedstock_exists(package_name: str) -> bool:
+  url = RECIPE_RAW_URL_TEMPLATE.format(package=package_name)
+  response = _SESSION.head(url, allow_redirects=True, timeout=(5, 15))
+  if response.status_code == 404:
+    return False
+  response.raise_for_status()
+  return True
+
+
+def get_feedstock_meta_yamls(
+  package_names: t.Iterable[str],
+  max_bytes: t.Optional[int] = None,
+) -> t.Dict[str, t.Optional[str]]:
+  package_names = list(package_names)
+  fetch = functools.partial(get_feedstock_meta_yaml, max_bytes=max_bytes)
+  return dict(zip(package_names, map_concurrently(fetch, package_names)))
+
+
+def upload_file(url: str, path: str) -> None:
+  # Passing the open file streams it; requests derives the Content-Length from the file's size.
+  for attempt in range(HTTP_RETRIES + 1):
+    last_attempt = attempt == HTTP_RETRIES
+    try:
+      with open(path, 'rb') as fp:
+        response = _SESSION.put(url, data=fp, timeout=(10, 300))
+    except requests.ConnectionError:
+      if last_attempt:
+        raise
+    else:
+      if response.status_code not in HTTP_RETRY_STATUSES or last_attempt:
+        response.raise_for_status()
+        return
+    time.sleep(0.5 * 2 ** attempt)
+
+
+def get_version_from_meta_yaml(meta_yaml: str) -> t.Optional[str]:
+  # Locate the tag with a plain substring search and only match the regex at its start, instead of
+  # scanning the whole recipe with the regex. Unusual spellings fall back to the full search.
+  match = None
+  index = meta_yaml.find('set version')
+  if index >= 0:
+    tag_start = meta_yaml.rfind('{%', 0, index)
+    if tag_start >= 0:
+      match = _VERSION_RE.match(meta_yaml, tag_start)
+  if not match:
+    match = _VERSION_RE.search(meta_yaml)
+  return match.group(1) if match else None
+
+
+@functools.lru_cache(maxsize=None)
+def _get_jinja_env() -> jinja2.Environment:
+  import jinja2
+  return jinja2.Environment()
 
 
 def parse_meta_yaml(meta_yaml: str) -> str:
-  return yaml.safe_load(jinja2.Environment().from_string(meta_yaml).render())
+  return yaml.load(_get_jinja_env().from_string(meta_yaml).render(), Loader=_YAML_LOADER)
+
+
+def _scan_requirements(meta_yaml: str) -> t.Optional[t.Dict[str, t.List[str]]]:
+  match = _REQUIREMENTS_RE.search(meta_yaml)
+  if not match:
+    return None
+  requirements: t.Dict[str, t.List[str]] = {}
+  section: t.Optional[str] = None
+  for line in meta_yaml[match.end():].splitlines():
+    if '{{' in line or '{%' in line or line.lstrip().startswith('{#'):
+      # Jinja statements may add or remove requirements and expressions must be rendered; only the full
+      # render gets them right.
+      return None
+    line = line.split('#', 1)[0].rstrip()
+    if not line.strip():
+      continue
+    if not line[0].isspace():
+      if _TOP_LEVEL_KEY_RE.match(line):
+        break
+      return None
+    line = line.strip()
+    if line.startswith('- ') and section is not None:
+      requirements[section].append(line[2:].strip().strip('\'"'))
+    elif line.endswith(':') and not line.startswith('-'):
+      section = line[:-1]
+      requirements[section] = []
+    else:
+      # Anything else (Jinja blocks, flow style lists, ...) needs the full parser.
+      return None
+  return requirements
+
+
+def get_requirements_from_meta_yaml(meta_yaml: str) -> t.Dict[str, t.List[str]]:
+  """
+  Returns the requirement specs per section (build, host, run, ...) of a recipe. Most recipes are simple
+  enough to be scanned line by line; only if that fails is the recipe rendered and parsed in full.
+  """
+
+  requirements = _scan_requirements(meta_yaml)
+  if requirements is not None:
+    return requirements
+
+  # Rendering is the expensive part, so its result is kept on disk keyed by the recipe's content.
+  digest = hashlib.blake2b(meta_yaml.encode('utf-8'), digest_size=16).hexdigest()
+  cache_file = CACHE_DIR / 'requirements' / f'{digest}.json'
+  try:
+    return json.loads(cache_file.read_text(encoding='utf-8'))
+  except (OSError, ValueError):
+    pass
+
+  requirements = parse_meta_yaml(meta_yaml).get('requirements') or {}
+  requirements = {section: deps or [] for section, deps in requirements.items()}
+  cache_file.parent.mkdir(parents=True, exist_ok=True)
+  cache_file.write_text(json.dumps(requirements), encoding='utf-8')
+  return requirements
 
 
 def get_package_name_from_version_selector(spec: str) -> str:
-  return re.split(r'[\s<>=!]', spec)[0]
+  return _DEP_SPLIT_RE.split(spec, maxsplit=1)[0]
+
+
+def get_build_generations(recipes_dir: str) -> t.List[t.List[str]]:
+  """
+  Returns the recipe directories in *recipes_dir* grouped into generations, where every recipe only depends
+  on recipes of earlier generations. The result is cached in the #CACHE_DIR and reused for as long as no
+  `meta.yaml` file was added, removed or modified.
+  """
+
+  recipe_files: t.Dict[str, str] = {}
+  with os.scandir(recipes_dir) as entries:
+    for entry in entries:
+      if not entry.is_dir() or entry.name == 'build': continue
+      recipe_files[entry.name] = os.path.join(entry.path, 'meta.yaml')
+
+  signature = hashlib.blake2b(digest_size=16)
+  for name, recipe_file in sorted(recipe_files.items()):
+    stat = os.stat(recipe_file)
+    signature.update(f'{name}\0{stat.st_mtime_ns}\0{stat.st_size}\0'.encode('utf-8'))
+  path_key = hashlib.blake2b(os.path.abspath(recipes_dir).encode('utf-8'), digest_size=16).hexdigest()
+  cache_file = CACHE_DIR / 'build-order' / f'{path_key}.json'
+  try:
+    cached = json.loads(cache_file.read_text(encoding='utf-8'))
+  except (OSError, ValueError):
+    cached = None
+  if cached and cached['signature'] == signature.hexdigest():
+    return cached['generations']
+
+  import networkx
+  packages = {name: get_requirements_from_meta_yaml(Path(f).read_text()) for name, f in recipe_files.items()}
+  graph = networkx.DiGraph()
+  graph.add_nodes_from(packages)
+  graph.add_edges_from(
+    (dep_name, package)
+    for package, requirements in packages.items()
+    for deps in requirements.values()
+    for dep_name in map(get_package_name_from_version_selector, deps)
+    if dep_name in packages)
+  generations = [sorted(generation) for generation in networkx.algorithms.dag.topological_generations(graph)]
+
+  cache_file.parent.mkdir(parents=True, exist_ok=True)
+  cache_file.write_text(json.dumps({'signature': signature.hexdigest(), 'generations': generations}), encoding='utf-8')
+  return generations
+
+
+def move_tree(src: str, dst: str) -> None:
+  """
+  Moves the directory *src* to *dst*, merging its contents into *dst* if it already exists. Files are renamed
+  instead of copied; the tree is only copied if *src* and *dst* are on different filesystems.
+  """
+
+  try:
+    if not os.path.exists(dst):
+      os.replace(src, dst)
+      return
+    for root, _dirs, files in os.walk(src):
+      target_dir = os.path.join(dst, os.path.relpath(root, src))
+      os.makedirs(target_dir, exist_ok=True)
+      for name in files:
+        os.replace(os.path.join(root, name), os.path.join(target_dir, name))
+  except OSError as exc:
+    if exc.errno != errno.EXDEV:
+      raise
+    shutil.copytree(src, dst, dirs_exist_ok=True)
+  # Remove what is left of the source: its empty directories after renaming, or the originals after copying.
+  shutil.rmtree(src)
+
+
+@contextlib.contextmanager
+def _grayskull_output() -> t.Iterator[None]:
+  """
+  Enables Grayskull's console output for the duration of the context and restores the previous settings
+  afterwards. The output is buffered and written in one piece at the end, so that it does not interleave
+  with that of recipes generated in parallel.
+  """
+
+  from grayskull.cli import CLIConfig
+  config = CLIConfig()
+  previous = config.stdout, config.list_missing_deps
+  config.stdout = config.list_missing_deps = True
+  buffer = io.StringIO()
+  try:
+    with contextlib.redirect_stdout(buffer):
+      yield
+  finally:
+    config.stdout, config.list_missing_deps = previous
+    sys.stdout.write(buffer.getvalue() + _ANSI['reset'])
+    sys.stdout.flush()
+
+
+def get_recipe_name(recipe: AbstractRecipeModel) -> str:
+  return recipe.get_var_content(recipe['package']['name'].values[0])
+
+
+def _pypi_cache() -> t.ContextManager[t.Any]:
+  """
+  Returns a context that caches the PyPI JSON API requests that Grayskull sends through `requests` for an
+  hour, if the optional `requests-cache` package is available. Anything else, such as the source archive
+  downloads, is not cached.
+  """
+
+  try:
+    import requests_cache
+  except ImportError:
+    return contextlib.nullcontext()
+  CACHE_DIR.mkdir(parents=True, exist_ok=True)
+  return requests_cache.enabled(
+    str(CACHE_DIR / 'pypi'),
+    backend='sqlite',
+    urls_expire_after={'pypi.org/pypi/*': 3600, '*': requests_cache.DO_NOT_CACHE})
+
+
+def create_recipe(
+  package: str,
+  version: str,
+  process_recipe: t.Optional[t.Callable[[AbstractRecipeModel], t.Any]] = None,
+) -> AbstractRecipeModel:
+  from grayskull.base.factory import GrayskullFactory
+  with _pypi_cache():
+    recipe = GrayskullFactory.create_recipe("pypi", package, version)
+  if process_recipe:
+    process_recipe(recipe)
+  return recipe
 
 
 def generate_recipe(
@@ -93,15 +529,8 @@ def generate_recipe(
   version: str,
   process_recipe: t.Optional[t.Callable[[AbstractRecipeModel], t.Any]] = None,
 ) -> None:
-  CLIConfig().stdout = True
-  CLIConfig().list_missing_deps = True
-  recipe = GrayskullFactory.create_recipe("pypi", package, version)
-  if process_recipe:
-    process_recipe(recipe)
-  recipe.generate_recipe(output_dir)
-  CLIConfig().stdout = False
-  CLIConfig().list_missing_deps = False
-  print(termcolor.RESET, end='')
+  with _grayskull_output():
+    create_recipe(package, version, process_recipe).generate_recipe(output_dir)
 
 
 def generate_recipe_into(
@@ -110,17 +539,86 @@ def generate_recipe_into(
   version: str,
   process_recipe: t.Optional[t.Callable[[AbstractRecipeModel], t.Any]] = None,
 ) -> None:
+  """
+  Like #generate_recipe(), but places the recipe files directly into *output_dir* instead of a subdirectory
+  named after the package.
+  """
+
+  output_dir = os.path.abspath(output_dir)
+  parent_dir = os.path.dirname(output_dir)
+  os.makedirs(parent_dir, exist_ok=True)
+
+  with _grayskull_output():
+    recipe = create_recipe(package, version, process_recipe)
+    name = get_recipe_name(recipe)
+    generated_dir = os.path.join(parent_dir, name)
+
+    # Grayskull writes into a subdirectory named after the (possibly prefixed) package. If that is the output
+    # directory or does not exist yet, we can generate in place and need at most one rename.
+    if generated_dir == output_dir or not os.path.exists(generated_dir):
+      recipe.generate_recipe(parent_dir)
+      if generated_dir != output_dir:
+        move_tree(generated_dir, output_dir)
+      return
 
-  # Capture the package name if it is changed in *process_recipe*.
-  def _processor(recipe: AbstractRecipeModel) -> None:
-    nonlocal package
-    if process_recipe:
-      process_recipe(recipe)
-      package = recipe.get_var_content(recipe['package']['name'].values[0])
+    # Generate next to the output directory so that the result can be moved into place by renaming it.
+    with tempfile.TemporaryDirectory(prefix='.tmp-', dir=parent_dir) as tempdir:
+      recipe.generate_recipe(tempdir)
+      move_tree(os.path.join(tempdir, name), output_dir)
 
-  with tempfile.TemporaryDirectory() as tempdir:
-    generate_recipe(tempdir, package, version, _processor)
-    shutil.copytree(os.path.join(tempdir, package), output_dir, dirs_exist_ok=True)
+
+def rerender_feedstock(conda: str, feedstock_dir: str, smithy_version: str, in_process: bool = True) -> None:
+  """
+  Rerenders the feedstock in *feedstock_dir*. If the same version of conda-smithy that *conda* would run is
+  importable from this interpreter, it is called in-process to save the interpreter and import startup.
+  """
+
+  if in_process:
+    try:
+      import conda_smithy
+      from conda_smithy.configure_feedstock import main as configure_feedstock
+    except ImportError:
+      pass
+    else:
+      if conda_smithy.__version__ == smithy_version:
+        configure_feedstock(os.path.abspath(feedstock_dir))
+        return
+  subprocess.check_call([conda, 'smithy', 'rerender'], cwd=feedstock_dir)
+
+
+def build_recipes(
+  conda: str,
+  recipe_dirs: t.List[str],
+  output_folder: str,
+  channels: t.List[str],
+  no_test: bool = False,
+  croot: t.Optional[str] = None,
+  in_process: bool = False,
+) -> None:
+  """
+  Builds the recipes in *recipe_dirs* in the given order. With *in_process*, the API of the `conda_build`
+  package importable from this interpreter is called instead of paying the startup of a `conda build`
+  process. That ignores *conda*, which is why it must be asked for explicitly.
+  """
+
+  if in_process:
+    try:
+      import conda_build.api
+    except ImportError:
+      pass
+    else:
+      kwargs = {'croot': croot} if croot else {}
+      conda_build.api.build(recipe_dirs, notest=no_test, output_folder=output_folder, channel_urls=channels, **kwargs)
+      return
+
+  command = [conda, 'build', *recipe_dirs, '--output-folder', output_folder]
+  for channel in channels:
+    command += ['-c', channel]
+  if no_test:
+    command += ['--no-test']
+  if croot:
+    command += ['--croot', croot]
+  subprocess.check_call(command)
 
 
 def get_argument_parser() -> argparse.ArgumentParser:
@@ -129,6 +627,7 @@ def get_argument_parser() -> argparse.ArgumentParser:
   parser.add_argument('-t', '--token', help='The GitHub token.')
   parser.add_argument('-b', '--branch', help='The branch name. If not specified, a default branch name will be selected.')
   parser.add_argument('-l', '--list', action='store_true', help='List the latest status of each feedstock.')
+  parser.add_argument('--refresh', action='store_true', help='With --list, also look up feedstocks that were recently found to be up to date.')
   parser.add_argument('-c', '--create', action='store_true', help='Create staged recipes.')
   parser.add_argument('-u', '--update', action='store_true', help='Update the recipe for a feedstock.')
   parser.add_argument('--prefix', help='Add a prefix to generated recipes and requirements known to the feedstock manager.')
@@ -137,9 +636,12 @@ def get_argument_parser() -> argparse.ArgumentParser:
   parser.add_argument('--build', default=NotImplemented, nargs='?', help='Build recipes from the specified directory (or the same directory as --generate).')
   parser.add_argument('--build-channel', action='append', help='Add conda channels for building.')
   parser.add_argument('--no-test', action='store_true', help='Dont test packages after build.')
+  parser.add_argument('--build-jobs', type=int, default=1, help='Build up to this many independent recipes in parallel. Pass 0 to use half the CPU cores, since every build is itself multi-threaded. By default, all recipes are built with a single conda build invocation.')
   parser.add_argument('--publish', default=NotImplemented, nargs='?', help='Publish built packages from the specified directory (or the same directory as --generate/--build)')
   parser.add_argument('--to', help='Publish built packages to the specified repository URL.')
   parser.add_argument('--kick', action='store_true', help='Submit an empty commit to a feedstock repo to kick off the build process once more.')
+  parser.add_argument('--no-inproc-rerender', action='store_true', help='Always rerender feedstocks by running `conda smithy rerender` in a subprocess.')
+  parser.add_argument('--inproc-build', action='store_true', help='Build recipes with the conda-build installed alongside this script instead of running `conda build` in a subprocess. The conda_bin option is ignored for building.')
   return parser
 
 
@@ -164,6 +666,10 @@ class Options:
   publish_from_dir: t.Optional[str] = None
   publish_to: t.Optional[str] = None
   no_test: bool = False
+  build_jobs: int = 1
+  inproc_rerender: bool = True
+  inproc_build: bool = False
+  refresh: bool = False
 
   @classmethod
   def from_args(cls, args: argparse.Namespace) -> 'Options':
@@ -174,6 +680,10 @@ class Options:
     self.build = args.build
     self.build_channels = args.build_channel or []
     self.no_test = args.no_test
+    self.inproc_rerender = not args.no_inproc_rerender
+    self.inproc_build = args.inproc_build
+    self.refresh = args.refresh
+    self.build_jobs = args.build_jobs if args.build_jobs > 0 else max(1, (os.cpu_count() or 1) // 2)
 
     do_build = args.build is not NotImplemented
     do_publish = args.publish is not NotImplemented
@@ -198,19 +708,33 @@ class Options:
 
   def get_github_client(self) -> t.Optional[github.Github]:
     if self.token:
+      import github
       return github.Github(self.token)
     return None
 
 
 class FeedstocksManager:
 
-  def __init__(self, config: Config, gh: t.Optional[github.Github], prefix: t.Optional[str] = None) -> None:
+  def __init__(
+    self,
+    config: Config,
+    gh: t.Optional[github.Github],
+    prefix: t.Optional[str] = None,
+    token: t.Optional[str] = None,
+  ) -> None:
     self._config = config
     self._gh = gh
     self._prefix = prefix
+    self._token = token
+    self._known_forks: t.Set[str] = set()
+
+  @functools.cached_property
+  def _package_versions(self) -> t.Dict[str, str]:
+    return {name: version for name, version in (package.split('@', 1) for package in self._config.feedstocks)}
 
-  def _get_package_versions(self) -> t.Dict[str, str]:
-    return dict(package.split('@') for package in self._config.feedstocks)
+  @functools.cached_property
+  def _packages_set(self) -> t.FrozenSet[str]:
+    return frozenset(self._package_versions)
 
   def _ensure_repo_is_cloned(
     self,
@@ -218,17 +742,42 @@ class FeedstocksManager:
     clone_url: str,
     upstream_url: t.Optional[str] = None,
     after_clone_steps: t.Optional[str] = None,
+    shallow: bool = False,
   ) -> None:
+    """
+    Clones *clone_url* into the *repo* path unless it exists. We never need the full history, so the clone
+    is either *shallow* (only the tip of `master`; only suitable if we push back to the same repository) or
+    otherwise a partial clone that fetches file contents on demand, which can still be pushed to a fork.
+    """
+
     if os.path.isdir(repo.path):
       return
-    repo.clone(clone_url)
+    clone_args = ['--no-tags']
+    if shallow:
+      clone_args += ['--depth=1', '--single-branch', '--branch=master']
+    else:
+      clone_args += ['--filter=blob:none']
+    subprocess.check_call(['git', '-c', 'protocol.version=2', 'clone', *clone_args, clone_url, repo.path])
     if upstream_url:
       repo.add_remote('upstream', upstream_url)
     if after_clone_steps:
       repo.check_call(['bash', '-c', after_clone_steps])
 
+  def _fetch_upstream(self, repo: nr.utils.git.Git) -> None:
+    """
+    Fetches only the `master` branch of the `upstream` remote, without tags and file contents. The remote is
+    registered as a promisor so that Git downloads the blobs when they are checked out.
+    """
+
+    repo.check_call(['git', 'config', 'remote.upstream.promisor', 'true'])
+    repo.check_call(['git', 'config', 'remote.upstream.partialclonefilter', 'blob:none'])
+    repo.check_call(['git', '-c', 'protocol.version=2', 'fetch', '--filter=blob:none', '--no-tags', 'upstream', 'master'])
+
   def _ensure_fork_exists(self, original_owner: str, repo: str) -> None:
+    import github
     assert self._gh is not None
+    if repo in self._known_forks:
+      return
     user_name = self._gh.get_user().login
     assert user_name == self._config.github_user, 'github user mismatch in config'
     try:
@@ -237,9 +786,49 @@ class FeedstocksManager:
       cprint(f'Forking {original_owner}/{repo}...', 'cyan')
       self._gh.get_repo(original_owner + '/' + repo).create_fork()
       # TODO (NiklasRosenstein): Wait for fork to be completed?
+    self._known_forks.add(repo)
+
+  def _ensure_forks_exist(self, original_owner: str, repos: t.List[str]) -> None:
+    """
+    Like #_ensure_fork_exists(), but checks all *repos* with a single GitHub GraphQL query and creates the
+    missing forks concurrently.
+    """
+
+    assert self._gh is not None and self._token is not None
+    user = self._config.github_user
+    fields = ''.join(
+      f'r{i}: repository(owner: {json.dumps(user)}, name: {json.dumps(repo)}) {{ id }}\n'
+      for i, repo in enumerate(repos))
+    response = _SESSION.post(
+      'https://api.github.com/graphql',
+      json={'query': f'query {{\nviewer {{ login }}\n{fields}}}'},
+      headers={'Authorization': f'bearer {self._token}'},
+      timeout=(5, 30))
+    response.raise_for_status()
+    payload = response.json()
+    errors = [e for e in payload.get('errors') or [] if e.get('type') != 'NOT_FOUND']
+    if errors:
+      raise RuntimeError(f'GitHub GraphQL query failed: {errors}')
+    data = payload['data']
+    assert data['viewer']['login'] == user, 'github user mismatch in config'
+
+    missing = [repo for i, repo in enumerate(repos) if data[f'r{i}'] is None]
+
+    # The forks are requested through the thread-safe shared session, as the PyGithub client must not be
+    # used from multiple threads.
+    def _fork(repo: str) -> None:
+      cprint(f'Forking {original_owner}/{repo}...', 'cyan')
+      _SESSION.post(
+        f'https://api.github.com/repos/{original_owner}/{repo}/forks',
+        headers={'Authorization': f'token {self._token}'},
+        timeout=(5, 30)).raise_for_status()
+
+    map_concurrently(_fork, missing)
+    self._known_forks.update(repos)
 
   def get_unpublished_packages(self) -> t.List[str]:
-    return [p for p in self._get_package_versions() if not get_feedstock_meta_yaml(p)]
+    packages = list(self._package_versions)
+    return [p for p, exists in zip(packages, map_concurrently(feedstock_exists, packages)) if not exists]
 
   def get_kickable_feedstocks(self) -> t.List[str]:
     """
@@ -248,37 +837,41 @@ class FeedstocksManager:
     as the repodata could be affected by CDN lags.
     """
 
-
     cprint('Collecting feedstocks that seem like they can be kicked...', 'cyan')
-    cprint('  Fetching repodata.json.bz2...', 'cyan')
-    packages = {}
-    packages.update(get_conda_forge_repodata('noarch')['packages'])
-    packages.update(get_conda_forge_repodata('linux-64')['packages'])
-
-    def _repodata_package_file(name: str) -> t.List[str]:
-      result: t.List[str] = []
-      for filename, info in packages.items():
-        if info['name'].lower() == name.lower():
-          result.append(filename)
-      return result
+    cprint('  Fetching repodata...', 'cyan')
+    package_index: t.Dict[str, t.Set[str]] = {}
+    for channel_index in map_concurrently(get_conda_forge_package_index, ['noarch', 'linux-64']):
+      for name, versions in channel_index.items():
+        package_index.setdefault(name, set()).update(versions)
 
-    missing: t.Dict[str, t.Set[str]] = {}
-    for package, version in self._get_package_versions().items():
+    package_versions = self._package_versions
+
+    # Fetch the recipe and (if the recipe is up to date) check if the version is published, for all feedstocks
+    # at once. Versions found in the repodata are certainly published; only the others need to be looked up.
+    def _fetch(package: str) -> t.Tuple[t.Optional[str], t.Optional[bool]]:
       meta_yaml = get_feedstock_meta_yaml(package)
+      version = package_versions[package]
+      if not meta_yaml or get_version_from_meta_yaml(meta_yaml) != version:
+        return meta_yaml, None
+      if version in package_index.get(package.lower(), ()):
+        return meta_yaml, True
+      return meta_yaml, version in get_anaconda_package_versions(package)
+
+    missing: t.Dict[str, t.Set[str]] = {}
+    for package, (meta_yaml, published) in zip(package_versions, map_concurrently(_fetch, package_versions)):
       if not meta_yaml:
         cprint(f'  Skipping {package} (feedstock missing)', 'yellow')
         continue
-      recipe_version = get_version_from_meta_yaml(meta_yaml)
-      if recipe_version != version:
+      if published is None:
         cprint(f'  Skipping {package} (feedstock not up to date)', 'yellow')
         continue
-      url = f'https://anaconda.org/conda-forge/{package}/files'
-      html = requests.get(url).text
-      if f'{package}-{version}' in html:
+      if published:
         cprint(f'  Skipping {package} (exists)', 'green')
         continue
-      recipe = parse_meta_yaml(meta_yaml)
-      requirements = Stream(recipe['requirements'].values()).concat().map(get_package_name_from_version_selector).collect(set)
+      requirements = {
+        get_package_name_from_version_selector(dep)
+        for deps in get_requirements_from_meta_yaml(meta_yaml).values()
+        for dep in deps}
       requirements.discard('python')
       missing[package] = requirements
 
@@ -292,7 +885,7 @@ class FeedstocksManager:
         cprint(f'  Skipping {package} (depends on another kickable package(s): {depends_on_kickables})', 'magenta')
         skip.add(package)
         continue
-      depends_on_cdn_delayed_packages = [p for p in requirements if not _repodata_package_file(p)]
+      depends_on_cdn_delayed_packages = [p for p in requirements if p.lower() not in package_index]
       if depends_on_cdn_delayed_packages:
         cprint(f'  Skipping {package} (depends on package(s) delayed by CDN: {depends_on_cdn_delayed_packages})', 'magenta')
         skip.add(package)
@@ -300,38 +893,71 @@ class FeedstocksManager:
 
     return list(missing.keys() - skip)
 
-  def list_feedstock_status(self) -> None:
-    package_versions = self._get_package_versions()
+  def list_feedstock_status(self, refresh: bool = False) -> None:
+    """
+    Prints the feedstock and PyPI versions of every configured package. Packages that were found to be up to
+    date within the last #LIST_STATE_MAX_AGE seconds are not looked up again, unless *refresh* is set.
+    """
+
+    package_versions = self._package_versions
+    state_file = Path(LIST_STATE_FILE)
+    state: t.Dict[str, t.Dict[str, t.Any]] = {}
+    if state_file.is_file():
+      state = json.loads(state_file.read_text())
+    now = time.time()
+
+    up_to_date = set()
+    if not refresh:
+      for package, target_version in package_versions.items():
+        entry = state.get(package)
+        if entry and entry['version'] == target_version and now - entry['observed_at'] < LIST_STATE_MAX_AGE:
+          up_to_date.add(package)
+    outdated = [p for p in package_versions if p not in up_to_date]
+
+    # The version is set at the top of the recipe, so we only need to download the start of it.
+    meta_yamls = get_feedstock_meta_yamls(outdated, max_bytes=META_YAML_HEAD_BYTES)
+    pypi_versions = dict(zip(outdated, map_concurrently(get_latest_pypi_version, outdated)))
     for package, target_version in package_versions.items():
-      pypi_version = get_latest_pypi_version(package)
-      meta_yaml = get_feedstock_meta_yaml(package)
+      if package in up_to_date:
+        print(f'{_ANSI["green"]}{package} {target_version} (on pypi: {target_version}){_ANSI["reset"]}')
+        continue
+      state.pop(package, None)
+      pypi_version = pypi_versions[package]
+      meta_yaml = meta_yamls[package]
       if meta_yaml:
         latest_version = get_version_from_meta_yaml(meta_yaml)
-        color = 'green' if (pypi_version == target_version and latest_version == target_version) else 'yellow'
+        if latest_version is None:
+          latest_version = get_version_from_meta_yaml(get_feedstock_meta_yaml(package) or '')
+        color = _ANSI['green'] if (pypi_version == target_version and latest_version == target_version) else _ANSI['yellow']
         if latest_version == target_version:
-          cprint(f'{package} {target_version} (on pypi: {pypi_version})', color)
+          print(f'{color}{package} {target_version} (on pypi: {pypi_version}){_ANSI["reset"]}')
+          if pypi_version == target_version:
+            state[package] = {'version': target_version, 'observed_at': now}
         else:
-          cprint(f'{package} {latest_version} (expected {target_version}) (on pypi: {pypi_version})', color)
+          print(f'{color}{package} {latest_version} (expected {target_version}) (on pypi: {pypi_version}){_ANSI["reset"]}')
       else:
-        cprint(f'{package} not found', 'red')
+        print(f'{_ANSI["red"]}{package} not found{_ANSI["reset"]}')
+
+    state_file.write_text(json.dumps(state, indent=2, sort_keys=True))
 
   def create_feedstocks(self, packages: t.List[str], branch_name: t.Optional[str] = None) -> None:
-    package_versions = self._get_package_versions()
+    package_versions = self._package_versions
     package_versions = {p: package_versions[p] for p in packages}
 
-    for package in package_versions:
-      meta_yaml = get_feedstock_meta_yaml(package)
-      if meta_yaml:
-        cprint(f'error: the feedstock for {package} already exists, try using -u,--update', 'red')
-        sys.exit(1)
+    existing = [p for p, exists in zip(package_versions, map_concurrently(feedstock_exists, package_versions)) if exists]
+    for package in existing:
+      cprint(f'error: the feedstock for {package} already exists, try using -u,--update', 'red')
+    if existing:
+      sys.exit(1)
 
+    import nr.utils.git
     repo = nr.utils.git.Git('data/staged-recipes')
     clone_url = f'git@github.com:{self._config.github_user}/staged-recipes'
     upstream_url = f'https://github.com/conda-forge/staged-recipes.git'
     if self._gh:
       self._ensure_fork_exists('conda-forge', 'staged-recipes')
     self._ensure_repo_is_cloned(repo, clone_url, upstream_url, self._config.after_clone)
-    repo.fetch('upstream')
+    self._fetch_upstream(repo)
 
     if not branch_name:
       branch_name = 'add-' + '-'.join(package_versions)
@@ -343,14 +969,15 @@ class FeedstocksManager:
     output_dir = os.path.join(repo.path, 'recipes')
     for package, version in package_versions.items():
       cprint(f'Creating {package} {version}', 'green')
-      generate_recipe(output_dir, package, version, self._process_recipe)
+    # Grayskull writes every recipe into its own subdirectory, so the recipes can be generated side by side.
+    self._generate_in_processes(generate_recipe, [(output_dir, p, v) for p, v in package_versions.items()])
 
     repo.add([os.path.relpath(output_dir, repo.path)])
     repo.commit(f'Add {", ".join(package_versions)}')
-    cb = repo.get_current_branch_name()
-    repo.push('origin', f'{cb}:{cb}', force=True)
+    repo.push('origin', f'{branch_name}:{branch_name}', force=True)
 
   def _get_cloned_feedstock(self, package: str, upstream_only: bool = False) -> nr.utils.git.Git:
+    import nr.utils.git
     repo = nr.utils.git.Git(f'data/{package}-feedstock' + ('-upstream' if upstream_only else ''))
     clone_url = f'git@github.com:{self._config.github_user}/{package}-feedstock'
     upstream_url = f'git@github.com:conda-forge/{package}-feedstock.git'
@@ -360,12 +987,13 @@ class FeedstocksManager:
       repo,
       upstream_url if upstream_only else clone_url,
       upstream_url,
-      self._config.after_clone)
+      self._config.after_clone,
+      shallow=upstream_only)
     if not upstream_only:
-      repo.fetch('upstream')
+      self._fetch_upstream(repo)
     return repo
 
-  def update_feedstock(self, package: str, branch_name: t.Optional[str] = None) -> None:
+  def _ensure_latest_conda_smithy(self) -> str:
     conda = self._config.get_conda_bin()
     conda_smithy_version = subprocess.check_output([conda, 'smithy', '--version']).decode().strip()
     latest_version = get_latest_conda_smithy_version()
@@ -373,9 +1001,35 @@ class FeedstocksManager:
       print(f'You have conda-smithy {conda_smithy_version} installed, but the latest version is {latest_version}.')
       print(f'Upgrading conda-smithy to the latest version {latest_version}...')
       subprocess.check_call([conda, 'install', '-c', 'conda-forge', 'conda-smithy==' + latest_version, '--yes'])
+    return latest_version
+
+  def update_feedstock(self, package: str, branch_name: t.Optional[str] = None, inproc_rerender: bool = True) -> None:
+    self.update_feedstocks([package], branch_name, inproc_rerender)
+
+  def update_feedstocks(
+    self,
+    packages: t.List[str],
+    branch_name: t.Optional[str] = None,
+    inproc_rerender: bool = True,
+  ) -> None:
+    smithy_version = self._ensure_latest_conda_smithy()
+    if self._gh and self._token:
+      self._ensure_forks_exist('conda-forge', [f'{package}-feedstock' for package in packages])
 
-    version = self._get_package_versions()[package]
-    repo = self._get_cloned_feedstock(package)
+    # Cloning and fetching the feedstocks is network bound and independent per feedstock, so we do it up front.
+    repos = map_concurrently(self._get_cloned_feedstock, packages, max_workers=GIT_WORKERS)
+    for package, repo in zip(packages, repos):
+      self._update_cloned_feedstock(package, repo, branch_name, smithy_version, inproc_rerender)
+
+  def _update_cloned_feedstock(
+    self,
+    package: str,
+    repo: nr.utils.git.Git,
+    branch_name: t.Optional[str],
+    smithy_version: str,
+    inproc_rerender: bool,
+  ) -> None:
+    version = self._package_versions[package]
 
     print(f'Creating upgrade PR for {package}@{version}')
     branch_name = branch_name or f'upgrade-to-{version}'
@@ -385,45 +1039,120 @@ class FeedstocksManager:
     output_dir = os.path.join(repo.path, 'recipe')
     generate_recipe_into(output_dir, package, version, self._process_recipe)
 
-    subprocess.check_call([conda, 'smithy', 'rerender'], cwd=repo.path)
+    rerender_feedstock(self._config.get_conda_bin(), repo.path, smithy_version, inproc_rerender)
 
+    from grayskull import __version__ as grayskull_version
     repo.add([os.path.relpath(output_dir, repo.path)])
     repo.commit(f"{package}@{version} (grayskull {grayskull_version})")
-    cb = repo.get_current_branch_name()
-    repo.push('origin', f'{cb}:{cb}', force=True)
+    repo.push('origin', f'{branch_name}:{branch_name}', force=True)
 
   def generate_recipes(self, recipes_dir: str, packages: t.List[str]) -> None:
-    package_versions = self._get_package_versions()
+    package_versions = self._package_versions
     os.makedirs(recipes_dir, exist_ok=True)
-    for package in packages:
-      parent_dir = os.path.join(recipes_dir, (self._prefix or '') + package)
-      generate_recipe_into(parent_dir, package, package_versions[package], lambda r: self._process_recipe(r, packages))
+    jobs = [(os.path.join(recipes_dir, (self._prefix or '') + p), p, package_versions[p]) for p in packages]
+    self._generate_in_processes(generate_recipe_into, jobs, packages)
+
+  def _generate_in_processes(
+    self,
+    generate: t.Callable[..., None],
+    jobs: t.List[t.Tuple[str, str, str]],
+    known_packages: t.Optional[t.Sequence[str]] = None,
+  ) -> None:
+    """
+    Calls *generate* (#generate_recipe() or #generate_recipe_into()) for every `(output_dir, package, version)`
+    job in a process pool. Grayskull keeps its settings in a process-global singleton, so we parallelize with
+    processes, not threads.
+    """
+
+    max_workers = max(1, min(GENERATE_WORKERS, os.cpu_count() or 1, len(jobs)))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as executor:
+      futures = [
+        executor.submit(_generate_recipe_worker, generate, self._config, self._prefix, *job, known_packages)
+        for job in jobs]
+      for future in futures:
+        future.result()
 
   def _process_recipe(self, recipe: AbstractRecipeModel, known_packages: t.Optional[t.Sequence[str]] = None) -> None:
-    if not self._prefix:
+    prefix = self._prefix
+    if not prefix:
       return
-    packages = set(known_packages if known_packages is not None else self._get_package_versions())
+    packages = frozenset(known_packages) if known_packages is not None else self._packages_set
+    split = _DEP_SPLIT_RE.split
 
     # Add the prefix to the recipe name and to requirements known to the feedstock manager.
     # NOTE: We could set the "name" variable, but it would impact also the PyPI source URL.
     name = recipe['package']['name'].values[0]
-    name.value = self._prefix + recipe.get_var_content(name)
+    name.value = prefix + recipe.get_var_content(name)
     for section in recipe['requirements']:
       for item in section:
-        package_name = get_package_name_from_version_selector(item.value[0])[0]
-        if package_name in packages:
-          item.value = self._prefix + item.value
+        if split(item.value, 1)[0] in packages:
+          item.value = prefix + item.value
+
+  def _kick_via_api(self, package: str) -> None:
+    # An empty commit is just a new commit object pointing to the same tree, no clone needed.
+    assert self._gh is not None
+    gh_repo = self._gh.get_repo(f'conda-forge/{package}-feedstock')
+    head = gh_repo.get_branch('master').commit.commit
+    commit = gh_repo.create_git_commit('Kick CI', head.tree, [head])
+    gh_repo.get_git_ref('heads/master').edit(sha=commit.sha)
+
+  def _kick_via_clone(self, package: str) -> None:
+    repo = self._get_cloned_feedstock(package, upstream_only=True)
+    repo.checkout('master')
+    repo.reset(hard=True)
+    repo.pull('origin', 'master')
+    repo.commit('Kick CI', allow_empty=True)
+    repo.push('origin')
 
   def kick_feedstocks(self, packages: t.List[str]) -> None:
+    """
+    Pushes an empty commit to each feedstock, through the GitHub API if a client is available or otherwise
+    from a clone of the feedstock. The PyGithub client must not be shared between threads, so only the
+    clones are kicked concurrently; the API kicks are just a few small requests each.
+    """
+
+    cprint(f'Kicking {", ".join(packages)}..', 'magenta')
+    if self._gh:
+      for package in packages:
+        self._kick_via_api(package)
+    else:
+      map_concurrently(self._kick_via_clone, packages, max_workers=GIT_WORKERS)
     for package in packages:
-      cprint(f'Kicking {package}..', 'magenta')
-      repo = self._get_cloned_feedstock(package, upstream_only=True)
-      repo.checkout('master')
-      repo.reset(hard=True)
-      repo.pull('origin', 'master')
-      repo.commit('Kick CI', allow_empty=True)
-      repo.push('origin')
-      print()
+      cprint(f'Kicked {package}', 'green')
+
+
+def _generate_recipe_worker(
+  generate: t.Callable[..., None],
+  config: Config,
+  prefix: t.Optional[str],
+  output_dir: str,
+  package: str,
+  version: str,
+  known_packages: t.Optional[t.Sequence[str]],
+) -> None:
+  """
+  Entrypoint for generating a recipe in a worker process of #FeedstocksManager._generate_in_processes().
+  """
+
+  manager = FeedstocksManager(config, None, prefix)
+  generate(output_dir, package, version, lambda r: manager._process_recipe(r, known_packages))
+
+
+def _build_recipe_worker(
+  conda: str,
+  recipe_dir: str,
+  output_folder: str,
+  channels: t.List[str],
+  no_test: bool,
+  in_process: bool,
+) -> None:
+  """
+  Entrypoint for building a recipe in a worker process when building recipes in parallel.
+  """
+
+  # A separate build root per recipe keeps concurrent builds from contending for its locks.
+  with tempfile.TemporaryDirectory(prefix=f'conda-bld-{os.path.basename(recipe_dir)}-') as croot:
+    build_recipes(conda, [recipe_dir], output_folder, channels, no_test, croot, in_process)
 
 
 def main():
@@ -431,17 +1160,17 @@ def main():
   args = parser.parse_args()
 
   with open('feedstocks.yml') as fp:
-    config = databind.json.load(yaml.safe_load(fp), Config)
+    config = Config.from_dict(yaml.load(fp, Loader=_YAML_LOADER))
 
   options = Options.from_args(args)
   if not options.action:
     parser.print_usage()
     return
 
-  manager = FeedstocksManager(config, options.get_github_client(), args.prefix)
+  manager = FeedstocksManager(config, options.get_github_client(), args.prefix, options.token)
 
   if options.action == Options.Action.LIST:
-    manager.list_feedstock_status()
+    manager.list_feedstock_status(options.refresh)
 
   elif options.action == Options.Action.CREATE:
     assert options.packages is not None
@@ -451,8 +1180,8 @@ def main():
     manager.create_feedstocks(options.packages, options.branch)
 
   elif options.action == Options.Action.UPDATE:
-    assert len(options.packages) == 1, len(options.packages)
-    manager.update_feedstock(options.packages[0], options.branch)
+    assert options.packages, 'no packages specified'
+    manager.update_feedstocks(options.packages, options.branch, options.inproc_rerender)
 
   elif options.action == Options.Action.BUILD_AND_STUFF:
     if options.generate_dir:
@@ -465,43 +1194,47 @@ def main():
     if options.build_from_dir:
       cprint(f'Building recipes in {options.build_from_dir}', 'magenta')
       build_dir = os.path.join(options.build_from_dir, 'build')
+      generations = get_build_generations(options.build_from_dir)
+
+      conda = config.get_conda_bin()
+      recipe_dirs = [[os.path.join(options.build_from_dir, p) for p in generation] for generation in generations]
+      build_args = (build_dir, options.build_channels, options.no_test)
 
-      packages: t.Dict[str, t.Dict[str, t.Any]] = {}
-      for directory in os.listdir(options.build_from_dir):
-        if directory == 'build': continue
-        with open(os.path.join(options.build_from_dir, directory, 'meta.yaml')) as fp:
-          packages[directory] = parse_meta_yaml(fp.read())
-
-      # Sort packages topologically.
-      graph = networkx.DiGraph()
-      graph.add_nodes_from(packages)
-      for package, meta in packages.items():
-        for section in meta['requirements']:
-          for dep in meta['requirements'][section]:
-            package_name = get_package_name_from_version_selector(dep)[0]
-            if package_name in packages:
-              graph.add_edge(package_name, package)
-
-      add_args = []
-      for channel in options.build_channels:
-        add_args += ['-c', channel]
-      if options.no_test:
-        add_args += ['--no-test']
-      for package in networkx.algorithms.topological_sort(graph):
-        recipe_dir = os.path.join(options.build_from_dir, package)
-        subprocess.check_call([config.get_conda_bin(), 'build', recipe_dir, '--output-folder', build_dir] + add_args)
+      if not generations:
+        cprint('  No recipes to build', 'yellow')
+      elif options.build_jobs <= 1:
+        # A single build pays the conda-build startup cost only once.
+        build_recipes(conda, [d for generation in recipe_dirs for d in generation], *build_args, in_process=options.inproc_build)
+      else:
+        # Recipes in the same generation do not depend on each other and can be built in parallel. The worker
+        # processes are reused across generations, so an in-process conda-build is only imported once per worker.
+        with concurrent.futures.ProcessPoolExecutor(max_workers=options.build_jobs) as executor:
+          for generation in recipe_dirs:
+            futures = [
+              executor.submit(_build_recipe_worker, conda, recipe_dir, *build_args, options.inproc_build)
+              for recipe_dir in generation]
+            for future in futures:
+              future.result()
 
     if options.publish_from_dir:
       cprint(f'Publishing built packages from {options.publish_from_dir}/build', 'magenta')
-      build_dir = Path(options.publish_from_dir) / 'build'
-      for channel in build_dir.iterdir():
-        if not channel.is_dir(): continue
-        for file_ in channel.iterdir():
-          if not file_.name.endswith('.tar.bz2'): continue
-          cprint(f'> {file_}', 'cyan')
-          with file_.open('rb') as fp:
-            url = posixpath.join(options.publish_to, channel.name, file_.name)
-            requests.put(url, data=fp).raise_for_status()
+      build_dir = os.path.join(options.publish_from_dir, 'build')
+      base_url = options.publish_to.rstrip('/')
+      uploads: t.List[t.Tuple[str, str]] = []
+      with os.scandir(build_dir) as channels:
+        for channel in channels:
+          if not channel.is_dir(): continue
+          with os.scandir(channel.path) as files:
+            for file_ in files:
+              if not file_.name.endswith('.tar.bz2'): continue
+              uploads.append((f'{base_url}/{channel.name}/{file_.name}', file_.path))
+
+      def _upload(upload: t.Tuple[str, str]) -> None:
+        url, file_ = upload
+        cprint(f'> {file_}', 'cyan')
+        upload_file(url, file_)
+
+      map_concurrently(_upload, uploads, max_workers=UPLOAD_WORKERS)
 
   elif options.action == Options.Action.KICK:
     if not options.packages: